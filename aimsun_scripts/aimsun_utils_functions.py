@@ -15,10 +15,11 @@ sections based on their use:
         experiments.
 """
 
+import argparse
 import os
 import sqlite3
 import sys
-from typing import Any, Dict, Mapping, NewType, List, Tuple
+from typing import Any, Dict, Mapping, NewType, List, Optional, Tuple
 
 import aimsun_config_utils
 import aimsun_input_utils
@@ -189,6 +190,42 @@ def get_object_per_internal_id(
     return aimsun_object
 
 
+def parse_simulation_argument(
+    simulation_names: List[str], argv: List[str]
+) -> Optional[str]:
+    """Takes in the names of the simulations a script can create or run and
+    the command line arguments given to the script. Returns the simulation
+    selected with the '--simulation' argument. Other arguments, such as the
+    ones Aimsun passes to scripts, are ignored.
+
+    Args:
+        simulation_names: Names of the simulations the script handles.
+        argv: Command line arguments given to the script, without the script
+            name.
+    Returns:
+        simulation_name: Name of the selected simulation, or None if no valid
+            simulation was given.
+    """
+    # The script runs inside the Aimsun process, where sys.argv may not exist
+    # and argparse exiting on an error would exit Aimsun. Hence the explicit
+    # prog, no help option and the errors being reported instead. Prefixes of
+    # '--simulation' are not accepted so that Aimsun arguments such as '--sim'
+    # are ignored too.
+    parser = argparse.ArgumentParser(
+        prog='aimsun_scripts', add_help=False, allow_abbrev=False)
+    parser.add_argument('--simulation')
+    try:
+        simulation_name = parser.parse_known_args(argv)[0].simulation
+    except SystemExit:
+        print('Could not parse the command line arguments, ignoring them.')
+        return None
+    if simulation_name is not None and simulation_name not in simulation_names:
+        print(f'Unknown simulation {simulation_name}, expected one of '
+              f'{simulation_names}. Ignoring it.')
+        return None
+    return simulation_name
+
+
 # ****************************************************************************
 # ************************ Demand data util functions ************************
 # ****************************************************************************
@@ -2267,18 +2304,21 @@ def set_gk_scenario_config(
         scenario_input_data.section_trajectories_statistics)
     # enable subsampling 5% of the trajectories that departs and finishes at
     # external centroids
-    centroid_ids = aimsun_model.getCatalog().getObjectsByType(
+    catalog = aimsun_model.getCatalog()
+    centroid_ids = catalog.getObjectsByType(
         aimsun_system.getActiveModel().getType("GKCentroid"))
+    # Look up each centroid once instead of once per O/D pair.
+    is_external_centroid = {
+        centroid_id: "ext" in catalog.find(centroid_id).getExternalId()
+        for centroid_id in centroid_ids
+    }
     for o_centroid_id in centroid_ids:
         for d_centroid_id in centroid_ids:
             trajectory_condition = create_trajectory_condition()
             trajectory_condition.origin = o_centroid_id
             trajectory_condition.destination = d_centroid_id
-            o_centroid_ext_id = aimsun_model.getCatalog().find(
-                o_centroid_id).getExternalId()
-            d_centroid_ext_id = aimsun_model.getCatalog().find(
-                d_centroid_id).getExternalId()
-            if "ext" in o_centroid_ext_id and "ext" in d_centroid_ext_id:
+            if (is_external_centroid[o_centroid_id]
+                    and is_external_centroid[d_centroid_id]):
                 # 5% for external to external.
                 trajectory_condition.percentage = 5
             else:
@@ -66,16 +66,6 @@ def create_master_control_plan_item():
     return GKScheduleMasterControlPlanItem()
 
 
-def create_q_date(year: int, month: int, day: int):
-    """Return Aimsun QDate object from given year, month, and day."""
-    return QDate(year, month, day)
-
-
-def create_trajectory_condition():
-    """Return empty Aimsun GKTrajectoryCondition object."""
-    return GKTrajectoryCondition()
-
-
 # 1. Create demand data
 
 # Load centroid configuration
@@ -103,7 +93,7 @@ traffic_demands = aimsun_config_utils.AimsunTrafficDemands(
     traffic_demands_filepath)
 print('Creating the traffic demands in Aimsun...')
 aimsun_utils_functions.create_traffic_demand(
-    traffic_demands, model, GKSystem.getSystem(), create_schedule_demand_item,
+    traffic_demands, model, AIMSUN_SYSTEM, create_schedule_demand_item,
     create_gk_time_duration)
 print('Done')
 
@@ -1,7 +1,13 @@
-"""Executes Aimsun simulation scenario."""
+"""Executes Aimsun simulation scenario.
 
+The simulation to run is selected by setting one of the flags below to True.
+When the script is given command line arguments, it can instead be selected
+with '--simulation macro' or '--simulation micro'.
+"""
+
+import sys
 from typing import List
-from aimsun_utils_functions import run_experiments
+from aimsun_utils_functions import parse_simulation_argument, run_experiments
 
 import aimsun_config_utils
 import aimsun_input_utils
@@ -14,21 +20,40 @@ from aimsun_folder_utils import (
 MACRO_BASELINE = False
 MICRO_BASELINE = False
 
-LIST_EXPERIMENT_EXTERNAL_ID: List[aimsun_input_utils.ExternalId] = []
 
-if MACRO_BASELINE:
-    LIST_EXPERIMENT_EXTERNAL_ID = [
-        scenario.experiment.external_id for scenario
-        in aimsun_config_utils.AimsunStaticMacroScenarios(
-            aimsun_macro_simulation_config_input_file(
-            )).aimsun_static_macroscenarios
-    ]
-elif MICRO_BASELINE:
-    LIST_EXPERIMENT_EXTERNAL_ID = [
-        aimsun_config_utils.AimsunScenario(
+def macro_baseline_experiment_external_ids(
+) -> List[aimsun_input_utils.ExternalId]:
+    """Get the External IDs of the baseline macroexperiments."""
+    return aimsun_config_utils.macro_experiment_external_ids(
+        aimsun_macro_simulation_config_input_file())
+
+
+def micro_baseline_experiment_external_ids(
+) -> List[aimsun_input_utils.ExternalId]:
+    """Get the External ID of the baseline microexperiment."""
+    return [
+        aimsun_config_utils.load_aimsun_scenario(
             aimsun_micro_simulation_config_input_file(
             )).experiment.external_id
     ]
 
+
+SIMULATIONS = {
+    'macro': macro_baseline_experiment_external_ids,
+    'micro': micro_baseline_experiment_external_ids
+}
+
+SIMULATION = parse_simulation_argument(
+    list(SIMULATIONS), getattr(sys, 'argv', [])[1:])
+
+LIST_EXPERIMENT_EXTERNAL_ID: List[aimsun_input_utils.ExternalId] = []
+
+if SIMULATION:
+    LIST_EXPERIMENT_EXTERNAL_ID = SIMULATIONS[SIMULATION]()
+elif MACRO_BASELINE:
+    LIST_EXPERIMENT_EXTERNAL_ID = macro_baseline_experiment_external_ids()
+elif MICRO_BASELINE:
+    LIST_EXPERIMENT_EXTERNAL_ID = micro_baseline_experiment_external_ids()
+
 run_experiments(
     LIST_EXPERIMENT_EXTERNAL_ID, model, GKSystem.getSystem())
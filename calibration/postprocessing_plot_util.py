@@ -5,21 +5,76 @@ from __future__ import annotations
 import datetime
 import os
 import sys
-from typing import Any, Dict, List, Iterable, Union
+from typing import Dict, List, Iterable, Union
 
 import numpy as np
-from sklearn.linear_model import LinearRegression
 
 from postprocessing_util import (
     AimsunMacroOutputDatabase,
     AimsunMicroOutputDatabase
 )
 
-sys.path.append(os.path.abspath(os.path.join('..', 'Utils')))
+module_path = os.path.abspath(os.path.join('..', 'Utils'))
+if module_path not in sys.path:
+    sys.path.append(module_path)
 
 from aimsun_input_utils import AimsunFlowRealDataSet, ExternalId, InternalId
 
 
+def __flow_per_time_to_arrays(
+    real_flow_per_time: Dict[datetime.time, Dict[ExternalId, float]],
+    simulated_flow_per_time: Dict[datetime.time, Dict[ExternalId, float]],
+    time_list: List[datetime.time]
+) -> tuple(np.array, np.array):
+    """Gather the real and simulated flow of every detector at each time within
+    time_list into two column arrays, in the detector order of the real flow.
+    """
+    flow_counts = [len(real_flow_per_time[time]) for time in time_list]
+    total_flow_count = sum(flow_counts)
+    all_real_flow_list = np.empty((total_flow_count, 1))
+    all_simulated_flow_list = np.empty((total_flow_count, 1))
+    start = 0
+    for time, flow_count in zip(time_list, flow_counts):
+        real_flow_dict = real_flow_per_time[time]
+        end = start + flow_count
+        # Fill each time slice in one pass over the detectors of that time,
+        # reading the simulated flow in the order of the real flow.
+        all_real_flow_list[start:end, 0] = np.fromiter(
+            real_flow_dict.values(), float, flow_count)
+        all_simulated_flow_list[start:end, 0] = np.fromiter(
+            map(simulated_flow_per_time[time].__getitem__, real_flow_dict),
+            float, flow_count)
+        start = end
+    return all_real_flow_list, all_simulated_flow_list
+
+
+def __city_detector_mask(
+    real_flow_per_time: Dict[datetime.time, Dict[ExternalId, float]],
+    time_list: List[datetime.time], city_common_id: str
+) -> np.array:
+    """Mark which of the flows gathered by __flow_per_time_to_arrays() come
+    from city detectors.
+    """
+    is_city_detector = np.empty(
+        sum(len(real_flow_per_time[time]) for time in time_list), dtype=bool)
+    # The detectors are normally the same at every time, so the city mask is
+    # only recomputed when the detectors differ from the previous time.
+    city_mask_detector_external_ids = None
+    start = 0
+    for time in time_list:
+        detector_external_ids = tuple(real_flow_per_time[time])
+        if detector_external_ids != city_mask_detector_external_ids:
+            city_mask = np.fromiter(
+                (city_common_id in detector_external_id
+                 for detector_external_id in detector_external_ids),
+                bool, len(detector_external_ids))
+            city_mask_detector_external_ids = detector_external_ids
+        end = start + len(city_mask)
+        is_city_detector[start:end] = city_mask
+        start = end
+    return is_city_detector
+
+
 def convert_flow_per_time_to_list(
     real_flow_per_time: Dict[datetime.time, Dict[ExternalId, float]],
     simulated_flow_per_time: Dict[datetime.time, Dict[ExternalId, float]],
@@ -53,49 +108,17 @@ def convert_flow_per_time_to_list(
                 detectors for each time within time_list aggregated together.
     """
     assert all(isinstance(time, datetime.time) for time in time_list)
+    all_real_flow_list, all_simulated_flow_list = __flow_per_time_to_arrays(
+        real_flow_per_time, simulated_flow_per_time, time_list)
     if city_common_id is None:
-        all_real_flow_list = []
-        all_simulated_flow_list = []
-        for time in time_list:
-            real_flow_dict = real_flow_per_time[time]
-            simulated_flow_dict = simulated_flow_per_time[time]
-            for detector_external_id, real_flow_value in \
-                    real_flow_dict.items():
-                all_real_flow_list.append(real_flow_value)
-                all_simulated_flow_list.append(
-                    simulated_flow_dict[detector_external_id])
-        assert len(all_real_flow_list) == len(all_simulated_flow_list)
-        all_real_flow_list = np.array(all_real_flow_list).reshape(-1, 1)
-        all_simulated_flow_list = np.array(
-            all_simulated_flow_list).reshape(-1, 1)
         return all_real_flow_list, all_simulated_flow_list
-    city_real_flow_list = []
-    city_simulated_flow_list = []
-    pems_real_flow_list = []
-    pems_simulated_flow_list = []
-    for time in time_list:
-        real_flow_dict = real_flow_per_time[time]
-        simulated_flow_dict = simulated_flow_per_time[time]
-        for detector_external_id, real_flow_value in \
-                real_flow_dict.items():
-            if city_common_id in detector_external_id:
-                city_real_flow_list.append(real_flow_value)
-                city_simulated_flow_list.append(
-                    simulated_flow_dict[detector_external_id])
-            else:
-                pems_real_flow_list.append(real_flow_value)
-                pems_simulated_flow_list.append(
-                    simulated_flow_dict[detector_external_id])
-    assert len(city_real_flow_list) == len(city_simulated_flow_list)
-    assert len(pems_real_flow_list) == len(pems_simulated_flow_list)
-    city_real_flow_list = np.array(city_real_flow_list).reshape(-1, 1)
-    city_simulated_flow_list = np.array(
-        city_simulated_flow_list).reshape(-1, 1)
-    pems_real_flow_list = np.array(pems_real_flow_list).reshape(-1, 1)
-    pems_simulated_flow_list = np.array(
-        pems_simulated_flow_list).reshape(-1, 1)
-    return city_real_flow_list, city_simulated_flow_list, \
-        pems_real_flow_list, pems_simulated_flow_list
+    is_city_detector = __city_detector_mask(
+        real_flow_per_time, time_list, city_common_id)
+    is_pems_detector = ~is_city_detector
+    return all_real_flow_list[is_city_detector], \
+        all_simulated_flow_list[is_city_detector], \
+        all_real_flow_list[is_pems_detector], \
+        all_simulated_flow_list[is_pems_detector]
 
 
 def get_linear_regression(
@@ -120,18 +143,39 @@ def get_linear_regression(
             indicator lines within the notebook.
         yhat: Predicted y-axis values according to the line of best fit.
     """
-    lin_reg_object = LinearRegression(fit_intercept=(not enforce_intercept))
-    lin_reg_object.fit(real_data_list, simulated_data_list)
-    slope = lin_reg_object.coef_
-    intercept = abs(lin_reg_object.intercept_)
-    r_sq = lin_reg_object.score(real_data_list, simulated_data_list)
-    yhat = np.dot(real_data_list, slope) + intercept
-    max_val = real_data_list.max()
-    if not enforce_intercept:
-        intercept_float = intercept[0]
+    # Contiguous float64 vectors, so the dot products below go through BLAS.
+    real_data = np.ascontiguousarray(real_data_list, dtype=np.float64).ravel()
+    simulated_data = np.ascontiguousarray(
+        simulated_data_list, dtype=np.float64).ravel()
+    simulated_mean = simulated_data.mean()
+    # Closed-form least squares for a single feature. When the real data does
+    # not vary (e.g. a single sample or constant flow) the slope is not
+    # determined, and like sklearn the minimum-norm solution of slope 0 is
+    # used.
+    if enforce_intercept:
+        real_sum_of_squares = real_data @ real_data
+        slope = ((real_data @ simulated_data) / real_sum_of_squares
+                 if real_sum_of_squares else 0.0)
+        intercept = 0.0
+    else:
+        real_mean = real_data.mean()
+        real_deviation = real_data - real_mean
+        real_sum_of_squares = real_deviation @ real_deviation
+        slope = ((real_deviation @ (simulated_data - simulated_mean))
+                 / real_sum_of_squares if real_sum_of_squares else 0.0)
+        intercept = simulated_mean - slope * real_mean
+    residuals = simulated_data - (slope * real_data + intercept)
+    simulated_deviation = simulated_data - simulated_mean
+    residual_sum_of_squares = residuals @ residuals
+    total_sum_of_squares = simulated_deviation @ simulated_deviation
+    if total_sum_of_squares:
+        r_sq = 1 - residual_sum_of_squares / total_sum_of_squares
     else:
-        intercept_float = intercept
-    return slope[0][0], intercept_float, r_sq, max_val, yhat
+        r_sq = 1.0 if not residual_sum_of_squares else 0.0
+    intercept = abs(intercept)
+    yhat = (slope * real_data + intercept).reshape(-1, 1)
+    max_val = real_data_list.max()
+    return slope, intercept, r_sq, max_val, yhat
 
 
 def process_real_flow_data(
@@ -158,41 +202,60 @@ def process_real_flow_data(
     real_flow_per_time = {}
     real_flow_per_detector = {}
     detector_external_id_list = []
+    # Mirrors detector_external_id_list for constant time membership checks.
+    detector_external_id_set = set()
 
     # Group flow by time.
     for time in time_list:
         flow_per_time_dict = {}
+        time_in_timedelta = datetime.timedelta(
+            hours=time.hour, minutes=time.minute) \
+            + datetime.timedelta(minutes=15)  # This line is the scaler
         for flow_real_data in real_flow_dataset.flow_data_set:
             detector_external_id = f"flow_{flow_real_data.external_id}"
-            if detector_external_id not in detector_external_id_list:
+            if detector_external_id not in detector_external_id_set:
+                detector_external_id_set.add(detector_external_id)
                 detector_external_id_list.append(detector_external_id)
-            time_in_timedelta = datetime.timedelta(
-                hours=time.hour, minutes=time.minute) \
-                + datetime.timedelta(minutes=15)  # This line is the scaler
             flow_per_time_dict[detector_external_id] = \
                 flow_real_data.flow_data[time_in_timedelta] * 4
         real_flow_per_time[time] = flow_per_time_dict
 
-    # Group flow by detectors.
-    for detector_external_id in detector_external_id_list:
-        flow_per_detector_dict = {}
-        for flow_real_data in real_flow_dataset.flow_data_set:
-            if f"flow_{flow_real_data.external_id}" == detector_external_id:
-                for time_key, flow_val in flow_real_data.flow_data.items():
-                    time = (datetime.datetime.min + time_key).time()
-                    if min(time_list) <= time <= max(time_list):
-                        flow_per_detector_dict[time] = flow_val * 4
-        real_flow_per_detector[detector_external_id] = flow_per_detector_dict
+    # Detectors are only collected for times of study.
+    if not detector_external_id_list:
+        return real_flow_per_time, real_flow_per_detector, \
+            detector_external_id_list
+
+    # Group flow by detectors in a single pass over the flow data set.
+    min_time = min(time_list)
+    max_time = max(time_list)
+    for flow_real_data in real_flow_dataset.flow_data_set:
+        flow_per_detector_dict = real_flow_per_detector.setdefault(
+            f"flow_{flow_real_data.external_id}", {})
+        for time_key, flow_val in flow_real_data.flow_data.items():
+            time = (datetime.datetime.min + time_key).time()
+            if min_time <= time <= max_time:
+                flow_per_detector_dict[time] = flow_val * 4
 
     return real_flow_per_time, real_flow_per_detector, detector_external_id_list
 
 
-def __revert_dict_of_dict(
-    dict_to_return: dict(Any, dict(Any, Any))
-) -> dict(Any, dict(Any, Any)):
-    """Revert a dictionary of dictionary."""
-    return {y: {x: dict_to_return[x][y] for x in dict_to_return}
-            for y in list(dict_to_return.values())[0]}
+def __group_flow_matrix(
+    time_list: list(datetime.time),
+    detector_external_id_list: list(ExternalId),
+    flow_matrix: np.ndarray
+) -> tuple(dict(datetime.time, dict(ExternalId, float)),
+           dict(ExternalId, dict(datetime.time, float))):
+    """Group a time x detector flow matrix by time and by detector."""
+    flow_per_time = {
+        time: dict(zip(detector_external_id_list, flow_row))
+        for time, flow_row in zip(time_list, flow_matrix.tolist())
+    }
+    flow_per_detector = {
+        detector_external_id: dict(zip(time_list, flow_column))
+        for detector_external_id, flow_column
+        in zip(detector_external_id_list, flow_matrix.T.tolist())
+    }
+    return flow_per_time, flow_per_detector
 
 
 def process_macro_simulated_flow_data(
@@ -215,17 +278,13 @@ def process_macro_simulated_flow_data(
         simulated_flow_per_detector: Simulated flow data grouped by detector.
             Used for flow profiles.
     """
-    # Group flow by time.
-    simulated_flow_per_time = {
-        time: {
-            detector_external_id: simulation_results_database[
-                time].get_detector_flow(detector_external_id)
-            for detector_external_id in detector_external_id_list
-        }
-        for time in simulation_results_database
-    }
-    return simulated_flow_per_time, __revert_dict_of_dict(
-        simulated_flow_per_time)
+    time_list = list(simulation_results_database)
+    flow_matrix = np.empty((len(time_list), len(detector_external_id_list)))
+    for i, time in enumerate(time_list):
+        flow_matrix[i] = simulation_results_database[time].get_detector_flows(
+            detector_external_id_list)
+    return __group_flow_matrix(
+        time_list, detector_external_id_list, flow_matrix)
 
 
 def process_micro_simulated_flow_data(
@@ -250,28 +309,32 @@ def process_micro_simulated_flow_data(
         simulated_flow_per_detector: Simulated flow data grouped by detector.
             Used for flow profiles.
     """
-    # Group flow by time.
-    simulated_flow_per_time = {
-        time: {
-            detector_external_id: simulation_results_database.get_detector_flow(
-                detector_external_id, time)
-            for detector_external_id in detector_external_id_list
-        }
-        for time in time_list
-    }
-    return simulated_flow_per_time, __revert_dict_of_dict(
-        simulated_flow_per_time)
+    flow_matrix = np.array(
+        simulation_results_database.get_detector_flows(
+            detector_external_id_list, time_list),
+        dtype=float).reshape(len(time_list), len(detector_external_id_list))
+    return __group_flow_matrix(
+        time_list, detector_external_id_list, flow_matrix)
 
 
 def process_network_delay_time_data(
     simulation_results_database: AimsunMicroOutputDatabase,
     time_intervals: List[datetime.time]
-) -> List[float]:
-    delay_times = []
-    for time in time_intervals:
-        delay_times.append(
-            simulation_results_database.get_total_delay_time(time))
-    return delay_times
+) -> np.ndarray:
+    """Helper function to extract the total network delay time at each time
+    interval from an AimsunMicroOutputDatabase object.
+
+    Args:
+        simulation_results_database: Aimsun output object that contains the
+            microsimulation details.
+        time_intervals: List of start times for each time interval within the
+            timeframe of study.
+    Returns:
+        delay_times: Delay time of the entire network at each time interval.
+    """
+    return np.fromiter(
+        map(simulation_results_database.get_total_delay_time, time_intervals),
+        dtype=np.float64, count=len(time_intervals))
 
 
 # Add more methods as needed.
@@ -5,6 +5,7 @@ import os
 import sys
 import unittest
 from unittest import mock
+import warnings
 
 import numpy as np
 
@@ -16,6 +17,7 @@ from aimsun_input_utils import FlowRealData, AimsunFlowRealDataSet
 from postprocessing_plot_util import (
     convert_flow_per_time_to_list,
     get_linear_regression,
+    process_micro_simulated_flow_data,
     process_real_flow_data
 )
 
@@ -108,6 +110,33 @@ class TestAllMethods(unittest.TestCase):
         self.assertTrue(r_sq_3 > 0.9)
         self.assertTrue(r_sq_3 < 1.0)
 
+    def test_get_linear_regression_constant_real_data(self):
+        """Verify that get_linear_regression() falls back to a slope of 0 when
+        the real flow data does not vary, as sklearn did.
+
+        This test case fits constant and all-zero real data, which make the
+        closed-form denominator 0, and checks that the fit is the flat line
+        through the mean of the simulated data (or through 0 when the
+        intercept is enforced) without any NaN or warning.
+        """
+        constant_real_data = np.array([5, 5, 5]).reshape(-1, 1)
+        zero_real_data = np.zeros((3, 1))
+        simulated_data = np.array([1, 2, 3]).reshape(-1, 1)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            slope, intercept, r_sq, max_val, yhat = get_linear_regression(
+                constant_real_data, simulated_data, False)
+            self.assertEqual((slope, intercept, r_sq, max_val),
+                             (0.0, 2.0, 0.0, 5))
+            self.assertTrue(np.array_equal(yhat, [[2.0], [2.0], [2.0]]))
+            slope, intercept, _, _, yhat = get_linear_regression(
+                zero_real_data, simulated_data, True)
+            self.assertEqual((slope, intercept), (0.0, 0.0))
+            self.assertTrue(np.array_equal(yhat, np.zeros((3, 1))))
+            slope, intercept, _, _, _ = get_linear_regression(
+                np.array([[5]]), np.array([[2]]), False)
+            self.assertEqual((slope, intercept), (0.0, 2.0))
+
     def test_process_real_flow_data(self):
         """Verify correctness of the function process_real_flow_data().
 
@@ -142,6 +171,40 @@ class TestAllMethods(unittest.TestCase):
         self.assertTrue(list(real_flow_per_detector.keys())
                         == AIMSUN_DETECTOR_EXTERNAL_ID_LIST)
 
+    def test_process_micro_simulated_flow_data(self):
+        """Verify correctness of the function
+        process_micro_simulated_flow_data().
+
+        This test case mocks an AimsunMicroOutputDatabase object whose flow
+        depends on the detector and time, and checks that the flow grouped by
+        time and grouped by detector both hold the same flow values.
+        """
+        simulation_results_database = mock.Mock()
+        simulation_results_database.get_detector_flows.side_effect = (
+            lambda detector_external_ids, time_intervals: [
+                [float(AIMSUN_DETECTOR_EXTERNAL_ID_LIST.index(
+                    detector_external_id) + 10 * TIME_LIST.index(time))
+                 for detector_external_id in detector_external_ids]
+                for time in time_intervals])
+
+        simulated_flow_per_time, simulated_flow_per_detector = \
+            process_micro_simulated_flow_data(
+                simulation_results_database, TIME_LIST,
+                AIMSUN_DETECTOR_EXTERNAL_ID_LIST)
+
+        self.assertTrue(list(simulated_flow_per_time.keys()) == TIME_LIST)
+        self.assertTrue(list(simulated_flow_per_detector.keys())
+                        == AIMSUN_DETECTOR_EXTERNAL_ID_LIST)
+        for i, time in enumerate(TIME_LIST):
+            for j, detector_external_id in enumerate(
+                    AIMSUN_DETECTOR_EXTERNAL_ID_LIST):
+                self.assertEqual(
+                    simulated_flow_per_time[time][detector_external_id],
+                    j + 10 * i)
+                self.assertEqual(
+                    simulated_flow_per_detector[detector_external_id][time],
+                    j + 10 * i)
+
 
 if __name__ == '__main__':
     unittest.main()
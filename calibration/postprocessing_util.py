@@ -4,18 +4,23 @@ from __future__ import annotations
 
 import datetime
 import enum
+import itertools
 import os
 import sqlite3
 import sys
-from typing import Any, Dict
+from typing import Any, Dict, List
 
-sys.path.append(os.path.abspath(os.path.join('..', 'utils')))
+module_path = os.path.abspath(os.path.join('..', 'utils'))
+if module_path not in sys.path:
+    sys.path.append(module_path)
 
 import aimsun_input_utils
 
 
 ALL_VEHICLE_TYPES = 0
 ALL_TIME_AGGREGATED = 0
+# Maximum number of parameters of an SQLite statement before SQLite 3.32.
+SQLITE_MAX_VARIABLE_NUMBER = 999
 
 
 
@@ -312,6 +317,67 @@ class SQLiteTable:
         assert len(result[0]) == 1  # only one data returned.
         return result[0][0]
 
+    def get_data_per_key_on_condition(
+        self, data_column_name: str, key_column_name_values: Dict[str, List],
+        condition_column_name_value: Dict[str, str] = None
+    ) -> Dict[tuple, Any]:
+        """Gets data of the rows for the given keys on condition in a single
+        query, keyed by the values of the key columns.
+
+        Args:
+            data_column_name: Name of the column that contains the data to be
+                queried in the output database SQL file.
+            key_column_name_values: Mapping of the columns whose values
+                identify each queried row. Key of the dictionary is column name
+                in the output database SQL file, and value of the dictionary is
+                the list of values of the column to query data for.
+            condition_column_name_value: Mapping of conditions that need to be
+                satisfied to query data. Key of the dictionary is column name
+                in the output database SQL file, and value of the dictionary is
+                the value of the column that needs to be equal to.
+        Returns:
+            Queried data from data_column_name that abides conditions in
+                condition_column_name_value, keyed by the tuple of the
+                values of the key columns in the same row, in the order of
+                key_column_name_values.
+        """
+        # The values of each key column are split in batches so that a query
+        # never has more than SQLITE_MAX_VARIABLE_NUMBER parameters, and one
+        # query is run per combination of batches.
+        batch_size = max(
+            1, SQLITE_MAX_VARIABLE_NUMBER // len(key_column_name_values))
+        key_value_batches = []
+        for values in key_column_name_values.values():
+            values = list(dict.fromkeys(values))
+            key_value_batches.append([
+                values[i:i + batch_size]
+                for i in range(0, len(values), batch_size)])
+        other_condition_list = []
+        if condition_column_name_value is not None:
+            other_condition_list = [
+                f"{condition_column_name} = '{condition_value}'"
+                for condition_column_name, condition_value
+                in condition_column_name_value.items()
+            ]
+        data_per_key = {}
+        for key_values in itertools.product(*key_value_batches):
+            condition_list = [
+                f"{key_column_name} IN ({', '.join('?' * len(values))})"
+                for key_column_name, values
+                in zip(key_column_name_values, key_values)
+            ] + other_condition_list
+            self.__cursor.execute(
+                f"SELECT {', '.join(key_column_name_values)}, "
+                f"{data_column_name} FROM {self.table_name} WHERE "
+                + " AND ".join(condition_list),
+                [value for values in key_values for value in values])
+            result = self.__cursor.fetchall()
+            batch_data_per_key = {row[:-1]: row[-1] for row in result}
+            # only one row per key.
+            assert len(batch_data_per_key) == len(result)
+            data_per_key.update(batch_data_per_key)
+        return data_per_key
+
 
 class AimsunOutputDatabase:
     """Data class to store common output data between both Aimsun micro and
@@ -392,6 +458,26 @@ class AimsunMacroOutputDatabase(AimsunOutputDatabase):
             {MaDetColumns.DETECTOR_EXTERNAL_ID.value: detector_external_id,
              MaDetColumns.VEHICLE_TYPE.value: ALL_VEHICLE_TYPES})
 
+    def get_detector_flows(
+        self, detector_external_ids: List[aimsun_input_utils.ExternalId]
+    ) -> List[float]:
+        """Get simulated flow through each of the specified detectors in a
+        single query. Used for Macrosimulations.
+
+        Args:
+            detector_external_ids: External IDs of the detectors we want the
+                flow data from.
+        Returns:
+            flow_values: Flow through each detector, in the order of
+                detector_external_ids.
+        """
+        flow_per_detector = self.detectors_table.get_data_per_key_on_condition(
+            MaDetColumns.FLOW.value,
+            {MaDetColumns.DETECTOR_EXTERNAL_ID.value: detector_external_ids},
+            {MaDetColumns.VEHICLE_TYPE.value: ALL_VEHICLE_TYPES})
+        return [flow_per_detector[(detector_external_id,)]
+                for detector_external_id in detector_external_ids]
+
     # Define more methods as needed.
 
 
@@ -525,6 +611,40 @@ class AimsunMicroOutputDatabase(AimsunOutputDatabase):
              MiDetColumns.VEHICLE_TYPE.value: ALL_VEHICLE_TYPES,
              MiDetColumns.TIME_INTERVAL.value: str(time_interval_int)})
 
+    def get_detector_flows(
+        self, detector_external_ids: List[aimsun_input_utils.ExternalId],
+        time_intervals: List[datetime.time]
+    ) -> List[List[float]]:
+        """Get simulated flow through each of the specified detectors at each
+        of the specified time intervals in a single query. Used for
+        Microsimulations.
+
+        Args:
+            detector_external_ids: External IDs of the detectors we want the
+                flow data from.
+            time_intervals: Time intervals of when we want the flow from.
+        Returns:
+            flow_values: Flow through each detector at each time interval. Each
+                row corresponds to a time interval of time_intervals and holds
+                the flow of each detector, in the order of
+                detector_external_ids.
+        """
+        time_interval_ints = [self.convert_time_to_int(time_interval)
+                              for time_interval in time_intervals]
+        flow_per_time_interval_and_detector = \
+            self.detectors_table.get_data_per_key_on_condition(
+                MiDetColumns.FLOW.value,
+                {MiDetColumns.TIME_INTERVAL.value: time_interval_ints,
+                 MiDetColumns.DETECTOR_EXTERNAL_ID.value:
+                     detector_external_ids},
+                {MiDetColumns.VEHICLE_TYPE.value: ALL_VEHICLE_TYPES})
+        return [
+            [flow_per_time_interval_and_detector[
+                (time_interval_int, detector_external_id)]
+             for detector_external_id in detector_external_ids]
+            for time_interval_int in time_interval_ints
+        ]
+
     def get_total_delay_time(self, time_interval: datetime.time) -> float:
         """Get total delay time across the network.
 
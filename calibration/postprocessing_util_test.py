@@ -0,0 +1,149 @@
+"""Tests for postprocessing_util."""
+
+import datetime
+import os
+import sqlite3
+import sys
+from typing import List
+import unittest
+
+module_path = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', 'utils'))
+if module_path not in sys.path:
+    sys.path.append(module_path)
+
+from postprocessing_util import (
+    AimsunMacroOutputDatabase,
+    AimsunMicroOutputDatabase,
+    SQLITE_MAX_VARIABLE_NUMBER
+)
+
+DETECTOR_EXTERNAL_ID_LIST = ['flow_a', 'flow_b', 'flow_c']
+TIME_LIST = [datetime.time(1, 0), datetime.time(1, 15), datetime.time(2, 45)]
+# The simulation starts at 01:00 and has 8 time intervals of 15 minutes.
+SIMULATION_START_TIME = 3600
+SIMULATION_DURATION = 7200
+SIMULATION_NUM_TIME_INTERVALS = 8
+
+
+def _create_tables(
+    database, detectors_table_name: str,
+    detector_external_id_list: List[str] = DETECTOR_EXTERNAL_ID_LIST
+):
+    """Create the tables read by the Aimsun output databases, with the column
+    types of the Aimsun output SQLite file.
+
+    Detectors of the network that are never queried are added with no external
+    ID and with a duplicate external ID.
+    """
+    database.execute(
+        "CREATE TABLE SIM_INFO (from_time INTEGER, duration INTEGER, "
+        "totalstatintervals INTEGER)")
+    database.execute(
+        "INSERT INTO SIM_INFO VALUES (?, ?, ?)",
+        (SIMULATION_START_TIME, SIMULATION_DURATION,
+         SIMULATION_NUM_TIME_INTERVALS))
+    database.execute(
+        f"CREATE TABLE {detectors_table_name} (oid INTEGER, eid TEXT, "
+        "sid INTEGER, ent INTEGER, flow REAL)")
+    detector_external_ids = detector_external_id_list + [
+        None, None, 'flow_duplicate', 'flow_duplicate']
+    for time_interval in range(1, SIMULATION_NUM_TIME_INTERVALS + 1):
+        for i, detector_external_id in enumerate(detector_external_ids):
+            for vehicle_type in range(2):
+                database.execute(
+                    f"INSERT INTO {detectors_table_name} "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (i, detector_external_id, vehicle_type, time_interval,
+                     _flow(i, time_interval, vehicle_type)))
+    database.commit()
+
+
+def _flow(
+    detector_index: int, time_interval: int, vehicle_type: int
+) -> float:
+    """Flow stored for a detector at a time interval and vehicle type."""
+    return float(detector_index + 10 * time_interval + 100 * vehicle_type)
+
+
+class TestAimsunOutputDatabases(unittest.TestCase):
+    """Test class to test the detector flow queries of the Aimsun output
+    databases."""
+
+    def test_micro_get_detector_flows(self):
+        """Verify that get_detector_flows() of AimsunMicroOutputDatabase
+        returns the flow that get_detector_flow() returns for each requested
+        detector and time, even when unrequested detectors have no or a
+        duplicate external ID.
+        """
+        database = AimsunMicroOutputDatabase(':memory:')
+        _create_tables(database.database, 'MIDETEC')
+        detector_external_ids = list(reversed(DETECTOR_EXTERNAL_ID_LIST))
+        flows = database.get_detector_flows(detector_external_ids, TIME_LIST)
+        self.assertEqual(flows, [
+            [database.get_detector_flow(detector_external_id, time)
+             for detector_external_id in detector_external_ids]
+            for time in TIME_LIST])
+        self.assertEqual(flows[2][0], _flow(2, 8, 0))
+
+    def test_macro_get_detector_flows(self):
+        """Verify that get_detector_flows() of AimsunMacroOutputDatabase
+        returns the flow that get_detector_flow() returns for each requested
+        detector, even when unrequested detectors have no or a duplicate
+        external ID.
+        """
+        database = AimsunMacroOutputDatabase(':memory:')
+        _create_tables(database.database, 'MADET')
+        # Macrosimulation results have a single time interval.
+        database.database.execute("DELETE FROM MADET WHERE ent > 1")
+        flows = database.get_detector_flows(DETECTOR_EXTERNAL_ID_LIST)
+        self.assertEqual(flows, [
+            database.get_detector_flow(detector_external_id)
+            for detector_external_id in DETECTOR_EXTERNAL_ID_LIST])
+
+    @unittest.skipUnless(hasattr(sqlite3.Connection, 'setlimit'),
+                         "requires sqlite3.Connection.setlimit()")
+    def test_get_detector_flows_many_detectors(self):
+        """Verify that get_detector_flows() of both output databases returns
+        the flow of every requested detector when there are more detectors
+        than parameters allowed in an SQLite statement of SQLite 3.32 and
+        earlier.
+        """
+        detector_external_ids = [
+            f"flow_{i}" for i in range(SQLITE_MAX_VARIABLE_NUMBER + 10)]
+        micro_database = AimsunMicroOutputDatabase(':memory:')
+        micro_database.database.setlimit(
+            sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, SQLITE_MAX_VARIABLE_NUMBER)
+        _create_tables(
+            micro_database.database, 'MIDETEC', detector_external_ids)
+        flows = micro_database.get_detector_flows(
+            detector_external_ids, TIME_LIST)
+        self.assertEqual(flows, [
+            [_flow(i, time_interval, 0)
+             for i in range(len(detector_external_ids))]
+            for time_interval in (1, 2, 8)])
+        macro_database = AimsunMacroOutputDatabase(':memory:')
+        macro_database.database.setlimit(
+            sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, SQLITE_MAX_VARIABLE_NUMBER)
+        _create_tables(
+            macro_database.database, 'MADET', detector_external_ids)
+        macro_database.database.execute("DELETE FROM MADET WHERE ent > 1")
+        flows = macro_database.get_detector_flows(detector_external_ids)
+        self.assertEqual(flows, [
+            _flow(i, 1, 0) for i in range(len(detector_external_ids))])
+
+    def test_fail_get_detector_flows_duplicate_external_id(self):
+        """Verify that get_detector_flows() raises an error when a requested
+        detector external ID matches several detectors, like
+        get_detector_flow() does.
+        """
+        database = AimsunMicroOutputDatabase(':memory:')
+        _create_tables(database.database, 'MIDETEC')
+        with self.assertRaises(AssertionError):
+            database.get_detector_flow('flow_duplicate', TIME_LIST[0])
+        with self.assertRaises(AssertionError):
+            database.get_detector_flows(['flow_duplicate'], TIME_LIST)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,6 +11,7 @@ calibration document for a more in depth descriptions.
 
 import datetime
 import enum
+from os import path
 import pickle
 from typing import List
 
@@ -132,8 +133,10 @@ class AimsunTrafficDemands:
                         f"Object at index {j} in list demand_items for object "
                         f"{traffic_demand}; attribute demand_external_id is "
                         "not type ExternalId.")
-        with open(filepath, 'wb') as file:
-            pickle.dump(self.traffic_demands, file)
+        with aimsun_input_utils.open_pickle_file_for_export(
+                filepath) as file:
+            pickle.dump(self.traffic_demands, file,
+                        aimsun_input_utils.PICKLE_PROTOCOL)
 
     def __import_from_file(self, filepath: str):
         """Function to import AimsunTrafficDemands object using pickle.
@@ -144,7 +147,8 @@ class AimsunTrafficDemands:
                 an error.
         """
         verify_filepath(filepath, 'pkl')
-        with open(filepath, 'rb') as file:
+        with open(filepath, 'rb',
+                  buffering=aimsun_input_utils.PICKLE_BUFFER_SIZE) as file:
             imported_traffic_demands = pickle.load(file)
             if not isinstance(imported_traffic_demands, List):
                 raise TypeError("imported_traffic_demands is not type List.")
@@ -1106,14 +1110,16 @@ class AimsunScenario(AimsunGenericScenario):
                     "trajectory_condition_list for object "
                     f"{trajectory_condition}; attribute "
                     "percentage is not type float.")
-        with open(filepath, 'wb') as file:
+        with aimsun_input_utils.open_pickle_file_for_export(
+                filepath) as file:
             pickle.dump([self.name, self.external_id, self.begin_date,
                          self.database_info, self.experiment,
                          self.master_control_plan_external_id,
                          self.real_dataset_external_id,
                          self.traffic_demand_external_id,
                          self.traffic_strategy_external_ids,
-                         self.scenario_input_data], file)
+                         self.scenario_input_data], file,
+                        aimsun_input_utils.PICKLE_PROTOCOL)
 
     def __import_from_file(self, filepath: str):
         """Function to import AimsunScenario object using pickle.
@@ -1124,7 +1130,8 @@ class AimsunScenario(AimsunGenericScenario):
                 an error.
         """
         verify_filepath(filepath, 'pkl')
-        with open(filepath, 'rb') as file:
+        with open(filepath, 'rb',
+                  buffering=aimsun_input_utils.PICKLE_BUFFER_SIZE) as file:
             att_list = pickle.load(file)
             imported_name = att_list[0]
             imported_external_id = att_list[1]
@@ -1310,8 +1317,10 @@ class AimsunStaticMacroScenarios:
                 an error.
         """
         verify_filepath(filepath, 'pkl')
-        with open(filepath, 'wb') as file:
-            pickle.dump(self.aimsun_static_macroscenarios, file)
+        with aimsun_input_utils.open_pickle_file_for_export(
+                filepath) as file:
+            pickle.dump(self.aimsun_static_macroscenarios, file,
+                        aimsun_input_utils.PICKLE_PROTOCOL)
 
     def __import_from_file(self, filepath: str):
         """Function to import AimsunStaticMacroScenarios object using pickle.
@@ -1322,5 +1331,86 @@ class AimsunStaticMacroScenarios:
                 an error.
         """
         verify_filepath(filepath, 'pkl')
-        with open(filepath, 'rb') as file:
+        with open(filepath, 'rb',
+                  buffering=aimsun_input_utils.PICKLE_BUFFER_SIZE) as file:
             self.aimsun_static_macroscenarios = pickle.load(file)
+
+
+# Config objects imported by __load_config(), keyed by filepath.
+__LOADED_CONFIGS = {}
+
+
+def __load_config(config_class: type, filepath: str):
+    """Import the config_class object stored at filepath, reusing the object
+    imported previously from filepath if the file has not been modified since.
+    Only the latest import of each filepath is kept, so re-exporting a config
+    replaces the previously imported object instead of accumulating them.
+
+    The cache only helps when the scripts importing a config run in the same
+    Python interpreter, as when they are run one after the other from the
+    Aimsun GUI. Scripts run with their own process, such as with
+    'aconsole -script ... --simulation micro', import the config every time.
+    """
+    modification_time = path.getmtime(filepath)
+    loaded_config = __LOADED_CONFIGS.get(filepath)
+    if loaded_config is None or loaded_config[:2] != (
+            config_class, modification_time):
+        loaded_config = (
+            config_class, modification_time, config_class(filepath))
+        __LOADED_CONFIGS[filepath] = loaded_config
+    return loaded_config[2]
+
+
+def load_aimsun_scenario(filepath: str) -> AimsunScenario:
+    """Import the AimsunScenario object stored at filepath.
+
+    As with load_aimsun_static_macroscenarios(), the object imported by
+    create_simulations.py is reused by run_simulation.py. The returned object
+    is shared between callers and should not be modified.
+
+    Args:
+        filepath: Location of the '.pkl' file to import the scenario from.
+    Returns:
+        aimsun_scenario: The imported AimsunScenario object.
+    """
+    return __load_config(AimsunScenario, filepath)
+
+
+def load_aimsun_static_macroscenarios(
+    filepath: str
+) -> AimsunStaticMacroScenarios:
+    """Import the AimsunStaticMacroScenarios object stored at filepath.
+
+    When Aimsun keeps the same Python interpreter alive between script
+    executions, the object imported by create_simulations.py is reused by
+    run_simulation.py instead of unpickling the config a second time. The
+    returned object is shared between callers and should not be modified.
+
+    Args:
+        filepath: Location of the '.pkl' file to import the macroscenarios
+            from.
+    Returns:
+        aimsun_static_macroscenarios: The imported AimsunStaticMacroScenarios
+            object.
+    """
+    return __load_config(AimsunStaticMacroScenarios, filepath)
+
+
+def macro_experiment_external_ids(
+    filepath: str
+) -> List[aimsun_input_utils.ExternalId]:
+    """Get the External IDs of the experiments of every macroscenario stored
+    in the AimsunStaticMacroScenarios config at filepath.
+
+    Args:
+        filepath: Location of the '.pkl' file to import the macroscenarios
+            from.
+    Returns:
+        experiment_external_ids: External IDs of the macroexperiments, in the
+            order the macroscenarios are stored in the config.
+    """
+    return [
+        scenario.experiment.external_id for scenario
+        in load_aimsun_static_macroscenarios(
+            filepath).aimsun_static_macroscenarios
+    ]
@@ -0,0 +1,201 @@
+"""Tests for the aimsun_config_utils script.
+
+The tests check that the config loaders reuse the object imported from a file
+until the file is exported again, and that they keep a single imported object
+per file.
+"""
+
+from __future__ import annotations
+
+import datetime
+import os
+import tempfile
+import unittest
+
+import aimsun_config_utils
+
+# Imported configs, cached by the module-private __load_config().
+LOADED_CONFIGS = vars(aimsun_config_utils)['__LOADED_CONFIGS']
+load_config = vars(aimsun_config_utils)['__load_config']
+
+
+class TestLoadAimsunStaticMacroScenarios(unittest.TestCase):
+    """Test load_aimsun_static_macroscenarios() and
+    macro_experiment_external_ids() in aimsun_config_utils.py.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(
+            self.directory.name, 'macroscenarios.pkl')
+        LOADED_CONFIGS.clear()
+
+    def tearDown(self):
+        LOADED_CONFIGS.clear()
+        self.directory.cleanup()
+
+    def test_load_reuses_object(self):
+        """Test that loading an unmodified file twice returns the same object.
+        """
+        _create_static_macroscenarios(['a', 'b']).export_to_file(self.filepath)
+        macroscenarios1 = aimsun_config_utils.load_aimsun_static_macroscenarios(
+            self.filepath)
+        macroscenarios2 = aimsun_config_utils.load_aimsun_static_macroscenarios(
+            self.filepath)
+        self.assertIs(macroscenarios1, macroscenarios2)
+
+    def test_load_after_export(self):
+        """Test that loading a file exported again returns a new object and
+        only keeps the latest one.
+        """
+        _create_static_macroscenarios(['a', 'b']).export_to_file(self.filepath)
+        macroscenarios1 = aimsun_config_utils.load_aimsun_static_macroscenarios(
+            self.filepath)
+        _create_static_macroscenarios(['c']).export_to_file(self.filepath)
+        _set_later_modification_time(self.filepath)
+        macroscenarios2 = aimsun_config_utils.load_aimsun_static_macroscenarios(
+            self.filepath)
+        self.assertIsNot(macroscenarios1, macroscenarios2)
+        self.assertEqual(
+            aimsun_config_utils.macro_experiment_external_ids(self.filepath),
+            ['c'])
+        self.assertEqual(len(LOADED_CONFIGS), 1)
+
+    def test_macro_experiment_external_ids(self):
+        """Test that macro_experiment_external_ids() returns the External IDs
+        of the experiments in the order the macroscenarios are stored.
+        """
+        _create_static_macroscenarios(
+            ['experiment 2', 'experiment 1', 'experiment 3']).export_to_file(
+                self.filepath)
+        self.assertEqual(
+            aimsun_config_utils.macro_experiment_external_ids(self.filepath),
+            ['experiment 2', 'experiment 1', 'experiment 3'])
+
+    def test_load_other_config_class(self):
+        """Test that loading a file as another config class does not return
+        the object imported as the first class.
+        """
+
+        class OtherStaticMacroScenarios(
+                aimsun_config_utils.AimsunStaticMacroScenarios):
+            """Config class importing the same file as
+            AimsunStaticMacroScenarios."""
+
+        _create_static_macroscenarios(['a']).export_to_file(self.filepath)
+        macroscenarios1 = aimsun_config_utils.load_aimsun_static_macroscenarios(
+            self.filepath)
+        macroscenarios2 = load_config(
+            OtherStaticMacroScenarios, self.filepath)
+        self.assertIsInstance(macroscenarios2, OtherStaticMacroScenarios)
+        self.assertIsNot(macroscenarios1, macroscenarios2)
+        macroscenarios3 = aimsun_config_utils.load_aimsun_static_macroscenarios(
+            self.filepath)
+        self.assertNotIsInstance(macroscenarios3, OtherStaticMacroScenarios)
+        self.assertEqual(len(LOADED_CONFIGS), 1)
+
+
+class TestLoadAimsunScenario(unittest.TestCase):
+    """Test load_aimsun_scenario() in aimsun_config_utils.py."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.directory.name, 'scenario.pkl')
+        LOADED_CONFIGS.clear()
+
+    def tearDown(self):
+        LOADED_CONFIGS.clear()
+        self.directory.cleanup()
+
+    def test_load_reuses_object(self):
+        """Test that loading an unmodified file twice returns the same
+        imported AimsunScenario object.
+        """
+        _create_scenario('scenario 1').export_to_file(self.filepath)
+        scenario1 = aimsun_config_utils.load_aimsun_scenario(self.filepath)
+        scenario2 = aimsun_config_utils.load_aimsun_scenario(self.filepath)
+        self.assertIsInstance(scenario1, aimsun_config_utils.AimsunScenario)
+        self.assertEqual(scenario1.external_id, 'scenario 1')
+        self.assertIs(scenario1, scenario2)
+
+    def test_load_after_export(self):
+        """Test that loading a file exported again returns the new scenario
+        and only keeps the latest one.
+        """
+        _create_scenario('scenario 1').export_to_file(self.filepath)
+        scenario1 = aimsun_config_utils.load_aimsun_scenario(self.filepath)
+        _create_scenario('scenario 2').export_to_file(self.filepath)
+        _set_later_modification_time(self.filepath)
+        scenario2 = aimsun_config_utils.load_aimsun_scenario(self.filepath)
+        self.assertIsNot(scenario1, scenario2)
+        self.assertEqual(scenario2.external_id, 'scenario 2')
+        self.assertEqual(len(LOADED_CONFIGS), 1)
+
+
+# ************************************************************
+# ******************** CREATE TEST OBJECTS *******************
+# ************************************************************
+
+
+def _set_later_modification_time(filepath: str):
+    """Move the modification time of filepath one second later, so that an
+    export within the resolution of the file system modification time is
+    still seen as a modification.
+    """
+    modification_time = os.path.getmtime(filepath) + 1
+    os.utime(filepath, (modification_time, modification_time))
+
+
+def _create_static_macroscenarios(
+    experiment_external_ids: list[str]
+) -> aimsun_config_utils.AimsunStaticMacroScenarios:
+    """Create an AimsunStaticMacroScenarios object with one macroscenario per
+    experiment External ID.
+
+    Args:
+        experiment_external_ids: External IDs of the macroexperiments, in the
+            order of the macroscenarios.
+    Returns:
+        macroscenarios: AimsunStaticMacroScenarios object.
+    """
+    macroscenarios = aimsun_config_utils.AimsunStaticMacroScenarios()
+    macroscenarios.aimsun_static_macroscenarios = []
+    for experiment_external_id in experiment_external_ids:
+        macroscenario = aimsun_config_utils.AimsunStaticMacroScenario()
+        macroscenario.experiment = (
+            aimsun_config_utils.AimsunStaticMacroExperiment())
+        macroscenario.experiment.external_id = experiment_external_id
+        macroscenarios.aimsun_static_macroscenarios.append(macroscenario)
+    return macroscenarios
+
+
+def _create_scenario(external_id: str) -> aimsun_config_utils.AimsunScenario:
+    """Create an AimsunScenario object that can be exported.
+
+    Args:
+        external_id: External ID of the scenario.
+    Returns:
+        scenario: AimsunScenario object.
+    """
+    scenario = aimsun_config_utils.AimsunScenario()
+    scenario.name = external_id
+    scenario.external_id = external_id
+    scenario.database_info = aimsun_config_utils.AimsunDataBaseInfo(
+        'database.sqlite')
+    scenario.experiment = aimsun_config_utils.AimsunMicroExperiment()
+    scenario.traffic_demand_external_id = 'traffic demand'
+    scenario.scenario_input_data = (
+        aimsun_config_utils.AimsunScenarioInputData())
+    scenario.scenario_input_data.detection_interval = datetime.timedelta(
+        minutes=15)
+    scenario.scenario_input_data.global_trajectories_statistics = False
+    scenario.scenario_input_data.section_trajectories_statistics = False
+    scenario.scenario_input_data.statistical_interval = datetime.timedelta(
+        minutes=15)
+    scenario.scenario_input_data.trajectories_statistics = False
+    scenario.scenario_input_data.trajectory_condition_list = []
+    return scenario
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -60,6 +60,30 @@ __MICROSIMULATION_OUTPUTS_PATH = path.join(__AIMSUN_OUTPUTS_PATH,
                                            'microsimulations')
 
 
+# Input files. These only depend on module state, so they are built once.
+__CENTROID_CONNECTIONS_AIMSUN_INPUT_FILE = path.join(
+    __AIMSUN_INPUT_CENTROID_CONNECTIONS_DATA_PATH,
+    f"centroid_connections_{__YEAR_OF_SIMULATION}.pkl")
+__DETECTOR_FLOW_AIMSUN_INPUT_FILE = path.join(
+    __AIMSUN_INPUT_TRAFFIC_DATA_PATH,
+    f"detector_flow_{__YEAR_OF_SIMULATION}.pkl")
+__MASTER_CONTROL_PLAN_AIMSUN_INPUT_FILE = path.join(
+    __AIMSUN_INPUT_MASTER_CONTROL_PLAN_DATA_PATH,
+    f"master_control_plan_{__YEAR_OF_SIMULATION}.pkl")
+__OD_DEMAND_AIMSUN_INPUT_FILE = path.join(
+    __AIMSUN_INPUT_DEMAND_DATA_PATH,
+    f"od_demand_{__YEAR_OF_SIMULATION}.pkl")
+__SPEED_AND_CAPACITY_AIMSUN_INPUT_FILE = path.join(
+    __AIMSUN_INPUT_SPEED_CAPACITY_DATA_PATH,
+    f"speed_limit_and_capacity_section_{__YEAR_OF_SIMULATION}.pkl")
+__TRAFFIC_DEMAND_AIMSUN_INPUT_FILE = path.join(
+    __AIMSUN_INPUT_DEMAND_DATA_PATH,
+    f"traffic_demand_{__YEAR_OF_SIMULATION}.pkl")
+__TRAFFIC_MANAGEMENT_AIMSUN_INPUT_FILE = path.join(
+    __AIMSUN_INPUT_TRAFFIC_MANAGEMENT_PATH,
+    f"traffic_management_{__YEAR_OF_SIMULATION}.pkl")
+
+
 def __filepath_with_epoch_directory(
     folder_path: str, epoch_name: str, filename: str
 ) -> str:
@@ -123,48 +147,34 @@ def aimsun_micro_simulation_config_input_file() -> str:
 
 def centroid_connections_aimsun_input_file() -> str:
     """Returns the centroid connections .pkl file location."""
-    return path.join(
-        __AIMSUN_INPUT_CENTROID_CONNECTIONS_DATA_PATH,
-        f"centroid_connections_{__YEAR_OF_SIMULATION}.pkl")
+    return __CENTROID_CONNECTIONS_AIMSUN_INPUT_FILE
 
 
 def detector_flow_aimsun_input_file() -> str:
     """Returns the detector flow .pkl file location."""
-    return path.join(
-        __AIMSUN_INPUT_TRAFFIC_DATA_PATH,
-        f"detector_flow_{__YEAR_OF_SIMULATION}.pkl")
+    return __DETECTOR_FLOW_AIMSUN_INPUT_FILE
 
 
 def master_control_plan_aimsun_input_file() -> str:
     """Returns the master control plan .pkl file location."""
-    return path.join(
-        __AIMSUN_INPUT_MASTER_CONTROL_PLAN_DATA_PATH,
-        f"master_control_plan_{__YEAR_OF_SIMULATION}.pkl")
+    return __MASTER_CONTROL_PLAN_AIMSUN_INPUT_FILE
 
 
 def od_demand_aimsun_input_file() -> str:
     """Returns the od demand .pkl file location."""
-    return path.join(
-        __AIMSUN_INPUT_DEMAND_DATA_PATH,
-        f"od_demand_{__YEAR_OF_SIMULATION}.pkl")
+    return __OD_DEMAND_AIMSUN_INPUT_FILE
 
 
 def speed_and_capacity_aimsun_input_file() -> str:
     """Returns the speed limit and capacity per section .pkl file location."""
-    return path.join(
-        __AIMSUN_INPUT_SPEED_CAPACITY_DATA_PATH,
-        f"speed_limit_and_capacity_section_{__YEAR_OF_SIMULATION}.pkl")
+    return __SPEED_AND_CAPACITY_AIMSUN_INPUT_FILE
 
 
 def traffic_demand_aimsun_input_file() -> str:
     """Returns the traffic demand .pkl file location."""
-    return path.join(
-        __AIMSUN_INPUT_DEMAND_DATA_PATH,
-        f"traffic_demand_{__YEAR_OF_SIMULATION}.pkl")
+    return __TRAFFIC_DEMAND_AIMSUN_INPUT_FILE
 
 
 def traffic_management_aimsun_input_file() -> str:
     """Returns the traffic management .pkl file location."""
-    return path.join(
-        __AIMSUN_INPUT_TRAFFIC_MANAGEMENT_PATH,
-        f"traffic_management_{__YEAR_OF_SIMULATION}.pkl")
+    return __TRAFFIC_MANAGEMENT_AIMSUN_INPUT_FILE
@@ -22,6 +22,13 @@ Global variables:
     MASTER_CONTROL_PLAN_EXTERNAL_ID: External ID of the master control plan.
     NETWORK_LAYER_NAME: Name of the Aimsun road section network layer.
     OSM_LAYER_NAME: Name of the OpenStreetMap layer.
+    PICKLE_BUFFER_SIZE: Buffer size in bytes of the files objects are pickled
+        to and from. Larger than the default so that reading or writing a
+        pickle takes a few large reads or writes instead of many small ones.
+    PICKLE_PROTOCOL: Pickle protocol used to export objects. Files are written
+        outside of Aimsun and read by the Python bundled with Aimsun, so this
+        is the highest protocol both can read rather than
+        pickle.HIGHEST_PROTOCOL.
     REAL_DATA_SET_EXTERNAL_ID: External ID of the real data set.
     SCENARIO_DATE: Default date for the Aimsun micro/macrosimulation scenario.
     TRAFFIC_STRATEGY_EXTERNAL_ID: External ID of the traffic strategy.
@@ -92,11 +99,15 @@ Classes:
 
 from __future__ import annotations
 
+import contextlib
 import csv
 import datetime
 import enum
+import math
+import os
 from os import path
 import pickle
+import tempfile
 from typing import NewType
 import warnings
 
@@ -112,6 +123,8 @@ DATABASE_DRIVER_NAME = "QSQLITE"
 MASTER_CONTROL_PLAN_EXTERNAL_ID = "master_control_plan"
 NETWORK_LAYER_NAME = "Network"
 OSM_LAYER_NAME = "OpenStreetMap"
+PICKLE_BUFFER_SIZE = 1 << 20
+PICKLE_PROTOCOL = 4
 REAL_DATA_SET_EXTERNAL_ID = "real_dataset"
 SCENARIO_DATE = datetime.date(2019, 1, 1)
 TRAFFIC_STRATEGY_EXTERNAL_ID = "Current Fremont Traffic Calming Strategy"
@@ -274,6 +287,49 @@ def od_matrix_name_generation(
     return f"{vehicle_type}_{time.strftime('%H_%M')}"
 
 
+def values_equal(value, other_value) -> bool:
+    """Compares two attribute values, treating NaN floats as equal to each
+    other so that an object still equals its exported and imported copy.
+
+    Args:
+        value: Attribute value of the first object.
+        other_value: Attribute value of the second object.
+    Returns:
+        equal: Whether both values are equal or both are NaN.
+    """
+    if (isinstance(value, float) and isinstance(other_value, float)
+            and math.isnan(value) and math.isnan(other_value)):
+        return True
+    return value == other_value
+
+
+@contextlib.contextmanager
+def open_pickle_file_for_export(filepath: str):
+    """Open a file to pickle an object to, replacing filepath atomically.
+
+    The object is written to a uniquely named temporary file next to filepath,
+    which replaces filepath only once writing succeeds. An export that fails
+    part way leaves any existing file at filepath untouched instead of
+    truncated, and concurrent exports to filepath never share a temporary file.
+
+    Args:
+        filepath: Location where the object should be exported to.
+    Yields:
+        file: Binary file object the object should be pickled to.
+    """
+    file_descriptor, temporary_filepath = tempfile.mkstemp(
+        suffix='.tmp', prefix=path.basename(filepath) + '.',
+        dir=path.dirname(filepath) or None)
+    try:
+        with open(file_descriptor, 'wb',
+                  buffering=PICKLE_BUFFER_SIZE) as file:
+            yield file
+        os.replace(temporary_filepath, filepath)
+    finally:
+        if path.exists(temporary_filepath):
+            os.remove(temporary_filepath)
+
+
 class AimsunObject:
     """The main class that is called whenever an Aimsun object is created. It
     stores a name, Internal ID, and External ID to distinguish every object
@@ -443,9 +499,9 @@ class CentroidConfiguration(AimsunObject):
                     raise TypeError(
                         f"Item at index {k} in list from_section_internal_ids "
                         "is not type InternalId.")
-        with open(filepath, 'wb') as file:
-            pickle.dump(self.external_id, file)
-            pickle.dump(self.centroid_connection_list, file)
+        with open_pickle_file_for_export(filepath) as file:
+            pickle.dump(self.external_id, file, PICKLE_PROTOCOL)
+            pickle.dump(self.centroid_connection_list, file, PICKLE_PROTOCOL)
 
     def __import_from_file(self, filepath: str):
         """Function to import CentroidConfiguration object using pickle.
@@ -459,7 +515,7 @@ class CentroidConfiguration(AimsunObject):
                 an error.
         """
         verify_filepath(filepath, 'pkl')
-        with open(filepath, "rb") as file:
+        with open(filepath, "rb", buffering=PICKLE_BUFFER_SIZE) as file:
             imported_ext_id = pickle.load(file)
             imported_connection_list = pickle.load(file)
             if not isinstance(imported_ext_id, str):
@@ -499,10 +555,25 @@ class OriginDestinationTripsCount:
         num_trips: Number of measured counts within the given time frame.
         origin_centroid_id: Origin centroid marked by External ID.
     """
+    # One object is created per OD pair and time interval, so the attributes
+    # are stored in slots instead of a per-instance __dict__.
+    __slots__ = ('destination_centroid_external_id', 'num_trips',
+                 'origin_centroid_external_id')
     destination_centroid_external_id: ExternalId
     num_trips: float
     origin_centroid_external_id: ExternalId
 
+    def __setstate__(self, state):
+        """Restore attributes when unpickling. Objects exported before
+        __slots__ was added are stored with a plain attribute dictionary.
+        """
+        instance_dict, slot_dict = (
+            state if isinstance(state, tuple) else (state, None))
+        for attributes in (instance_dict, slot_dict):
+            if attributes:
+                for attribute, value in attributes.items():
+                    setattr(self, attribute, value)
+
 
 class OriginDestinationMatrix(AimsunObject):
     """Data class to relate time intervals, locations, and demand together in
@@ -602,9 +673,10 @@ class OriginDestinationMatrices:
                 raise TypeError(
                     f"Object at index {i} in list od_matrices; "
                     "attribute vehicle_type is not type VehicleTypeName.")
-        with open(filepath, 'wb') as file:
-            pickle.dump(self.od_matrices, file)
-            pickle.dump(self.centroid_configuration_external_id, file)
+        with open_pickle_file_for_export(filepath) as file:
+            pickle.dump(self.od_matrices, file, PICKLE_PROTOCOL)
+            pickle.dump(
+                self.centroid_configuration_external_id, file, PICKLE_PROTOCOL)
 
     def __import_from_file(self, filepath: str):
         """Function to import OriginDestinationMatricies object using pickle.
@@ -619,7 +691,7 @@ class OriginDestinationMatrices:
                 an error.
         """
         verify_filepath(filepath, 'pkl')
-        with open(filepath, "rb") as file:
+        with open(filepath, "rb", buffering=PICKLE_BUFFER_SIZE) as file:
             imported_od_matrices = pickle.load(file)
             imported_external_id = pickle.load(file)
             if not isinstance(imported_od_matrices, list):
@@ -637,7 +709,35 @@ class OriginDestinationMatrices:
             self.centroid_configuration_external_id = imported_external_id
 
     def __eq__(self, other) -> bool:
-        return str(self) == str(other)
+        # Compares the same fields as __str__, stopping at the first
+        # mismatch instead of formatting every OD trip of both objects. Values
+        # are compared by value, so 1 and 1.0 trips are equal although their
+        # strings differ.
+        if not isinstance(other, OriginDestinationMatrices):
+            return False
+        od_matrices = getattr(self, 'od_matrices', [])
+        other_od_matrices = getattr(other, 'od_matrices', [])
+        if len(od_matrices) != len(other_od_matrices):
+            return False
+        for od_matrix, other_od_matrix in zip(od_matrices, other_od_matrices):
+            if (od_matrix.begin_time_interval
+                    != other_od_matrix.begin_time_interval
+                    or od_matrix.end_time_interval
+                    != other_od_matrix.end_time_interval
+                    or od_matrix.vehicle_type != other_od_matrix.vehicle_type
+                    or len(od_matrix.od_trips_count)
+                    != len(other_od_matrix.od_trips_count)):
+                return False
+            for od_trip, other_od_trip in zip(
+                    od_matrix.od_trips_count, other_od_matrix.od_trips_count):
+                if (od_trip.origin_centroid_external_id
+                        != other_od_trip.origin_centroid_external_id
+                        or od_trip.destination_centroid_external_id
+                        != other_od_trip.destination_centroid_external_id
+                        or not values_equal(od_trip.num_trips,
+                                            other_od_trip.num_trips)):
+                    return False
+        return True
 
     def __str__(self) -> str:
         string = "Origin Destination Matrices:\n"
@@ -679,7 +779,18 @@ class SectionSpeedLimitAndCapacity:
     capacity_in_vehicles_per_hour: float
 
     def __eq__(self, other) -> bool:
-        return str(self) == str(other)
+        if not isinstance(other, SectionSpeedLimitAndCapacity):
+            return False
+        # Like __str__, an attribute that is not set only equals an attribute
+        # that is not set either.
+        for attribute in ('section_internal_id', 'speed_limit_in_km_per_hour',
+                          'capacity_in_vehicles_per_hour'):
+            if hasattr(self, attribute) != hasattr(other, attribute):
+                return False
+            if hasattr(self, attribute) and not values_equal(
+                    getattr(self, attribute), getattr(other, attribute)):
+                return False
+        return True
 
     def __str__(self) -> str:
         string = "Section Speed Limit And Capacity:\n"
@@ -752,8 +863,9 @@ class SectionSpeedLimitsAndCapacities:
                     f"Object at index {i} in list "
                     "speed_limit_and_capacity_list; attribute"
                     "capacity_in_vehicles_per_hour is not type float.")
-        with open(filepath, 'wb') as file:
-            pickle.dump(self.speed_limit_and_capacity_list, file)
+        with open_pickle_file_for_export(filepath) as file:
+            pickle.dump(
+                self.speed_limit_and_capacity_list, file, PICKLE_PROTOCOL)
 
     def __import_from_file(self, filepath: str):
         """Function to import SectionSpeedLimitsAndCapacities
@@ -769,7 +881,7 @@ class SectionSpeedLimitsAndCapacities:
                 an error.
         """
         verify_filepath(filepath, 'pkl')
-        with open(filepath, "rb") as file:
+        with open(filepath, "rb", buffering=PICKLE_BUFFER_SIZE) as file:
             imported_slc_list = pickle.load(file)
             if not isinstance(imported_slc_list, list):
                 raise TypeError("imported_slc_list is not type List.")
@@ -781,7 +893,10 @@ class SectionSpeedLimitsAndCapacities:
             self.speed_limit_and_capacity_list = imported_slc_list
 
     def __eq__(self, other) -> bool:
-        return str(self) == str(other)
+        if not isinstance(other, SectionSpeedLimitsAndCapacities):
+            return False
+        return (getattr(self, 'speed_limit_and_capacity_list', [])
+                == getattr(other, 'speed_limit_and_capacity_list', []))
 
     def __str__(self) -> str:
         string = "Section Speed Limits and Capacities:\n"
@@ -1048,8 +1163,8 @@ class Detectors:
         # Check if file exists at given filepath
         if path.exists(filepath):
             warnings.warn('File already exists at filepath. Overwriting file.')
-        with open(filepath, 'wb') as file:
-            pickle.dump(self.detector_list, file)
+        with open_pickle_file_for_export(filepath) as file:
+            pickle.dump(self.detector_list, file, PICKLE_PROTOCOL)
 
     def __import_from_file(self, filepath: str):
         """Function to import Detectors object using pickle.
@@ -1064,7 +1179,7 @@ class Detectors:
                 an error.
         """
         verify_filepath(filepath, 'pkl')
-        with open(filepath, "rb") as file:
+        with open(filepath, "rb", buffering=PICKLE_BUFFER_SIZE) as file:
             imported_det_list = pickle.load(file)
             if not isinstance(imported_det_list, list):
                 raise TypeError("imported_det_list is not type List.")
@@ -1147,17 +1262,17 @@ class AimsunFlowRealDataSet(AimsunObject):
             assert isinstance(
                 detector_flow_data.aimsun_section_internal_id, int)
         # Serialize flow_data_set and write to filepath
-        with open(filepath, 'wb') as file:
+        with open_pickle_file_for_export(filepath) as file:
             if not isinstance(self.external_id, str):
                 raise TypeError('external_id is not type string.')
             if not all(isinstance(fds, FlowRealData) for fds
                        in self.flow_data_set):
                 raise TypeError(
                     'flow_data_set contains non-FlowRealData object.')
-            pickle.dump(self.flow_data_set, file)
-            pickle.dump(self.external_id, file)
-            pickle.dump(self.filename, file)
-            pickle.dump(self.line_to_skip, file)
+            pickle.dump(self.flow_data_set, file, PICKLE_PROTOCOL)
+            pickle.dump(self.external_id, file, PICKLE_PROTOCOL)
+            pickle.dump(self.filename, file, PICKLE_PROTOCOL)
+            pickle.dump(self.line_to_skip, file, PICKLE_PROTOCOL)
 
     def __import_from_file(self, filepath: str):
         """Import OutputFlowDataSet from file by deserializing `flow_data_set`
@@ -1170,7 +1285,7 @@ class AimsunFlowRealDataSet(AimsunObject):
             filepath: Location to import object attributes from.
         """
         # Deserialize flow_data_set from filepath
-        with open(filepath, 'rb') as file:
+        with open(filepath, 'rb', buffering=PICKLE_BUFFER_SIZE) as file:
             imported_flow_data_set = pickle.load(file)
             external_id = pickle.load(file)
             filename = pickle.load(file)
@@ -1840,13 +1955,13 @@ class MasterControlPlan(AimsunObject):
         if not isinstance(self.name, str):
             raise TypeError("name attribute is not a string.")
         # Serialize attributes and write to file
-        with open(filepath, 'wb') as file:
-            pickle.dump(self.schedule, file)
-            pickle.dump(self.control_plans, file)
-            pickle.dump(self.meterings, file)
-            pickle.dump(self.detectors, file)
-            pickle.dump(self.external_id, file)
-            pickle.dump(self.name, file)
+        with open_pickle_file_for_export(filepath) as file:
+            pickle.dump(self.schedule, file, PICKLE_PROTOCOL)
+            pickle.dump(self.control_plans, file, PICKLE_PROTOCOL)
+            pickle.dump(self.meterings, file, PICKLE_PROTOCOL)
+            pickle.dump(self.detectors, file, PICKLE_PROTOCOL)
+            pickle.dump(self.external_id, file, PICKLE_PROTOCOL)
+            pickle.dump(self.name, file, PICKLE_PROTOCOL)
 
     def __import_from_file(self, filepath: str):
         """Import MasterControlPlan from file by deserializing `schedule`.
@@ -1861,7 +1976,7 @@ class MasterControlPlan(AimsunObject):
         if not path.exists(filepath):
             raise FileNotFoundError('No file exists in given filepath.')
         # Deserialize schedule from filepath
-        with open(filepath, 'rb') as file:
+        with open(filepath, 'rb', buffering=PICKLE_BUFFER_SIZE) as file:
             imported_schedule = pickle.load(file)
             imported_control_plans = pickle.load(file)
             imported_meterings = pickle.load(file)
@@ -1996,10 +2111,10 @@ class TrafficManagementStrategy(AimsunObject):
         # Check that all attributes are of valid object type
 
         # Serialize flow_data_set and write to filepath
-        with open(filepath, 'wb') as file:
-            pickle.dump(self.policies, file)
-            pickle.dump(self.name, file)
-            pickle.dump(self.external_id, file)
+        with open_pickle_file_for_export(filepath) as file:
+            pickle.dump(self.policies, file, PICKLE_PROTOCOL)
+            pickle.dump(self.name, file, PICKLE_PROTOCOL)
+            pickle.dump(self.external_id, file, PICKLE_PROTOCOL)
 
     def __import_from_file(self, filepath: str):
         """Import TraffiCManagementStrategy from file by deserializing
@@ -2010,7 +2125,7 @@ class TrafficManagementStrategy(AimsunObject):
         """
         # Deserialize policies from filepath
         verify_filepath(filepath, 'pkl')
-        with open(filepath, 'rb') as file:
+        with open(filepath, 'rb', buffering=PICKLE_BUFFER_SIZE) as file:
             imported_policies = pickle.load(file)
             imported_name = pickle.load(file)
             imported_external_id = pickle.load(file)
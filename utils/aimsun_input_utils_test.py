@@ -22,6 +22,7 @@ import random
 import tempfile
 from typing import Dict
 import unittest
+from unittest import mock
 import warnings
 
 import aimsun_input_utils
@@ -255,6 +256,18 @@ class TestOriginDestinationMatrices(unittest.TestCase):
         self.assertFalse(odm1.__eq__(odm7))
         self.assertFalse(odm1.__eq__(odm8))
 
+    def test_equality_nan_trips(self):
+        """Test that OriginDestinationMatrices objects with NaN trip counts
+        equal their exported and imported copy, as their strings do."""
+        filepath = os.path.join(os.getcwd(), 'test_pickle.pkl')
+        odm1 = _create_static_od_matrices_object(5, 5, 15, float('nan'), 0)
+        odm1.export_to_file(filepath)
+        odm2 = aimsun_input_utils.OriginDestinationMatrices(filepath)
+        self.assertEqual(odm1, odm2)
+        self.assertNotEqual(
+            odm1, _create_static_od_matrices_object(5, 5, 15, 100.0, 0))
+        os.remove(filepath)
+
     def test_export_basic(self):
         """Test that exporting OriginDestinationMatrices objects work properly.
         """
@@ -294,6 +307,39 @@ class TestOriginDestinationMatrices(unittest.TestCase):
         os.remove(filepath)
         self.assertFalse(os.path.exists(filepath))
 
+    def test_import_legacy_od_trips_count(self):
+        """Test that OriginDestinationTripsCount objects pickled with an
+        attribute dictionary, as before __slots__ was added, are imported.
+        """
+
+        class LegacyOriginDestinationTripsCount:
+            """OriginDestinationTripsCount as it was before __slots__."""
+
+        LegacyOriginDestinationTripsCount.__module__ = (
+            aimsun_input_utils.__name__)
+        LegacyOriginDestinationTripsCount.__qualname__ = (
+            'OriginDestinationTripsCount')
+        legacy_od_trip = LegacyOriginDestinationTripsCount()
+        legacy_od_trip.origin_centroid_external_id = 'origin_centroid'
+        legacy_od_trip.destination_centroid_external_id = 'dest_centroid'
+        legacy_od_trip.num_trips = 12.5
+        # Pickle looks the class up by module and name, so the legacy class
+        # stands in for the current one while dumping.
+        with mock.patch.object(
+                aimsun_input_utils, 'OriginDestinationTripsCount',
+                LegacyOriginDestinationTripsCount):
+            legacy_pickle = pickle.dumps(legacy_od_trip, protocol=3)
+
+        od_trip = pickle.loads(legacy_pickle)
+        self.assertIsInstance(
+            od_trip, aimsun_input_utils.OriginDestinationTripsCount)
+        self.assertEqual(od_trip.num_trips, 12.5)
+        self.assertEqual(
+            od_trip.destination_centroid_external_id, 'dest_centroid')
+        self.assertEqual(
+            od_trip.origin_centroid_external_id, 'origin_centroid')
+        self.assertFalse(hasattr(od_trip, '__dict__'))
+
     def test_create_from_filepath(self):
         """Test that the same OriginDestinationMatrices is retrievable from a
         given filepath.
@@ -423,6 +469,23 @@ class TestSectionSpeedLimitsAndCapacities(unittest.TestCase):
         self.assertFalse(sslacs1.__eq__(sslacs5))
         self.assertFalse(sslacs1.__eq__(sslacs6))
 
+    def test_equality_nan_and_missing_values(self):
+        """Test that SectionSpeedLimitAndCapacity objects with NaN values equal
+        their exported and imported copy, and that an attribute that is not set
+        differs from one set to None, as in their strings."""
+        filepath = os.path.join(os.getcwd(), 'test_pickle.pkl')
+        sslacs1 = _create_static_section_slacs_object(5, float('nan'), 200.0)
+        sslacs1.export_to_file(filepath)
+        sslacs2 = aimsun_input_utils.SectionSpeedLimitsAndCapacities(filepath)
+        self.assertEqual(sslacs1, sslacs2)
+        os.remove(filepath)
+        section1 = aimsun_input_utils.SectionSpeedLimitAndCapacity()
+        section2 = aimsun_input_utils.SectionSpeedLimitAndCapacity()
+        self.assertEqual(section1, section2)
+        section2.capacity_in_vehicles_per_hour = None
+        self.assertNotEqual(section1, section2)
+        self.assertNotEqual(section2, section1)
+
     def test_export_basic(self):
         """Test that exporting SectionSpeedLimitsAndCapacities objects work
         properly.
@@ -573,6 +636,39 @@ class TestDetectors(unittest.TestCase):
             self.assertTrue(len(detector_warning) == 1)
         os.remove(filepath)
 
+    def test_detectors_export_failure_keeps_existing_file(self):
+        """Verify that a failed export leaves the existing file unchanged and
+        removes its temporary file."""
+        filepath = os.path.join(tempfile.gettempdir(), "detectors_5.pkl")
+        detectors = _create_detectors(5)
+        detectors.export_to_file(filepath)
+        with self.assertRaises(pickle.PicklingError):
+            with aimsun_input_utils.open_pickle_file_for_export(
+                    filepath) as file:
+                file.write(b'partial')
+                raise pickle.PicklingError
+        self.assertFalse(os.path.exists(file.name))
+        self.assertEqual(detectors, aimsun_input_utils.Detectors(filepath))
+        os.remove(filepath)
+
+    def test_detectors_concurrent_exports(self):
+        """Verify that concurrent exports to the same file write to separate
+        temporary files, so that the export finishing last replaces the file
+        and neither removes the temporary file of the other."""
+        filepath = os.path.join(tempfile.gettempdir(), "detectors_7.pkl")
+        detectors = _create_detectors(7)
+        with aimsun_input_utils.open_pickle_file_for_export(
+                filepath) as first_file:
+            with aimsun_input_utils.open_pickle_file_for_export(
+                    filepath) as second_file:
+                self.assertNotEqual(first_file.name, second_file.name)
+                pickle.dump(_create_detectors(3).detector_list, second_file)
+            pickle.dump(detectors.detector_list, first_file)
+        self.assertFalse(os.path.exists(first_file.name))
+        self.assertFalse(os.path.exists(second_file.name))
+        self.assertEqual(detectors, aimsun_input_utils.Detectors(filepath))
+        os.remove(filepath)
+
     def test_detectors_export_empty_dataset(self):
         """Verify that export_to_file() throws an exception when
         DetectorIdToRoadSections object has empty flow_data_set."""
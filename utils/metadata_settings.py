@@ -35,8 +35,6 @@ def get_simulation_year() -> int:
 
 def get_time_intervals() -> List[datetime.time]:
     """Return time intervals used within the study."""
-    time_intervals = []
-    for hour in range(__START_HOUR, __END_HOUR):
-        for minute in range(0, 60, __TIMESTEP_MINUTES):
-            time_intervals.append(datetime.time(hour, minute))
-    return time_intervals
+    return [datetime.time(hour, minute)
+            for hour in range(__START_HOUR, __END_HOUR)
+            for minute in range(0, 60, __TIMESTEP_MINUTES)]